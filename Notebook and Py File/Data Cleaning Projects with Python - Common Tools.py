@@ -11,9 +11,11 @@
 # 
 # __IMPORTANT NOTE: The data set for 'EXAMPLE 2 - New York City Trees' can be downloaded at https://data.cityofnewyork.us/Environment/2015-Street-Tree-Census-Tree-Data/uvpi-gqnh__
 
-# In[243]:
+# In[1]:
 
 
+from pathlib import Path
+
 import pandas as pd
 import numpy as np
 
@@ -29,33 +31,50 @@ import numpy as np
 # - Some entries are duplicates
 # - There is a column with irrelevant information.
 # - Some rows have missing values.
+# 
+# Reading an Excel file is slow because every sheet has to be unzipped and parsed as XML. The first time this cell runs, the Excel file is converted to a Parquet file which is much faster to load every time after that. If the Excel file is edited or replaced, the Parquet file is rebuilt. Phone numbers are read as strings because some of them are stored as numbers and others as text, and a Parquet column can only hold one type.
+
+# In[2]:
 
-# In[153]:
 
+customer_excel = Path("Customer Call List.xlsx") #Enter your path
+customer_parquet = customer_excel.with_suffix('.parquet')
 
-df = pd.read_excel("Customer Call List.xlsx") #Enter your path
+#Rebuild the Parquet file if it is missing or the Excel file was changed after it was created.
+#If only the Parquet file is available, it is used as is.
+if not customer_parquet.exists() or (customer_excel.exists() and customer_excel.stat().st_mtime > customer_parquet.stat().st_mtime):
+    pd.read_excel(customer_excel, dtype={'Phone_Number': str}).to_parquet(customer_parquet)
+
+df = pd.read_parquet(customer_parquet)
 df
 
 
-# ### DROP DUPLICATE ENTRIES
+# ### STORE TEXT AS ARROW STRINGS
+# 
+# By default pandas stores text in `object` columns, which are arrays of separate Python strings. The `string[pyarrow]` dtype keeps the text in one continuous Arrow buffer so the `.str` methods used throughout this notebook run much faster. This requires the `pyarrow` package to be installed.
 # 
-# `df.drop_duplicates()` 
+# `df.select_dtypes(include=['object', 'string'])` - selects only the text columns, whether they have the object dtype or a string dtype (pandas 3 reads text as strings by default)
 
-# In[154]:
+# In[3]:
 
 
-df = df.drop_duplicates()
-df
+for column in df.select_dtypes(include=['object', 'string']):
+    df[column] = df[column].astype('string[pyarrow]')
+df.dtypes
 
 
-# ### DROP NOT USEFUL COLUMNS
+# ### DROP NOT USEFUL COLUMNS AND DUPLICATE ENTRIES
 # 
 # `df.drop(columns = "COLUMNNAME")`
+# 
+# `df.drop_duplicates(ignore_index=True)` - `ignore_index=True` renumbers the remaining rows
+# 
+# Both are chained in one line so the table is only copied once. The column is dropped first so it is not taken into account when looking for duplicates.
 
-# In[155]:
+# In[4]:
 
 
-df = df.drop(columns = "Not_Useful_Column")
+df = df.drop(columns = "Not_Useful_Column").drop_duplicates(ignore_index=True)
 df
 
 
@@ -66,7 +85,7 @@ df
 # - df['Last_Name'].str.rstrip("""...""") removes the last value from the right
 # - df['Last_Name'].str.strip("""/._""") removes first and last values. This example removes all values '/', '.', and '_'.
 
-# In[156]:
+# In[5]:
 
 
 df['Last_Name'] = df['Last_Name'].str.strip("/._") #NOTE: Strip must NOT be in list format!
@@ -75,77 +94,79 @@ df
 
 # ### FORMAT PHONE NUMBERS - REMOVE NON-DIGIT CHARACTERS
 # 
-# `df['COLUMNNAME'].str.replace(regex, replacementvalue)`
+# `df['COLUMNNAME'].str.replace(regex, replacementvalue, regex=True)`
 # 
-# regex - regex value
+# regex - regex value. Pass it as a plain string: Arrow string columns run the regex in Arrow's own fast engine, while a pattern compiled with `re.compile()` makes pandas fall back to a much slower Python path.
 # 
 # replacementvalue - value to replace the regex value
 
-# In[157]:
+# In[6]:
 
 
-#Phone numbers aren't considered strings so it so the strip method doesn't work.
-df['Phone_Number'] = df['Phone_Number'].str.replace('[\W]','')
-df['Phone_Number'].str.replace('[^a-zA-z0-9]','') #alternative (inefficient) method
+#Phone numbers were read as strings when the Excel file was loaded, so the .str methods work directly.
+df['Phone_Number'] = df['Phone_Number'].str.replace(r'\W+', '', regex=True)
 df
 
 
 # ### FORMAT PHONE NUMBERS - UNIFY THE PHONE NUMBER FORMAT
 # 
-# `df.apply()` - Apply a function to the DataFrame.
+# `df['COLUMNNAME'].str[start:stop]` - slices every string value in the column at once.
 # 
 # 
-# `df.apply(lambda x: x+3)` - lambda are equivalent to single expression functions
+# `df.apply(lambda x: x+3)` - lambda are equivalent to single expression functions. `df.apply()` would also work here but it calls the function once per row, which is much slower than the `.str` methods.
 # 
 # ![image.png](attachment:image.png)
 
-# In[158]:
+# In[7]:
 
 
-df['Phone_Number'] = df['Phone_Number'].apply(lambda x: str(x))
-df['Phone_Number'] = df['Phone_Number'].apply(lambda x: x[0:3] + '-' + x[3:6] + '-' + x[6:10])
+phone = df['Phone_Number']
+df['Phone_Number'] = phone.str[:3] + '-' + phone.str[3:6] + '-' + phone.str[6:10]
 df
 
 
 # ### FORMAT PHONE NUMBERS - REMOVE NULL VALUES
 # 
+# Values that aren't phone numbers such as 'N/a' were turned into 'Na--', and missing phone numbers are still missing (`<NA>`). Only a 10 digit number is a valid phone number, which is 12 characters long once the dashes are added, so everything else is blanked out.
 # 
+# `df['COLUMNNAME'].where(condition, othervalue)` - keeps the values where the condition is True and replaces the rest with othervalue
 
-# In[159]:
+# In[8]:
 
 
-df['Phone_Number'] = df['Phone_Number'].str.replace('nan--', '')
-df['Phone_Number'] = df['Phone_Number'].str.replace('Na--', '')
+#A formatted phone number such as '123-545-5421' is 12 characters long. Missing phone numbers have no length so they count as invalid
+is_valid = df['Phone_Number'].str.len().eq(12).fillna(False)
+df['Phone_Number'] = df['Phone_Number'].where(is_valid, '')
 df
 
 
 # Formatting the Address
 # 
-# `df.str.split` (separator, #columns, expand=True)
+# `df.str.split` (separator, n=#splits, expand=True)
 # 
 # __separator__ - the separated value which is usually a comma but can also be a '|', '/' or even a space
 # 
-# __#columns__ - the number of desired columns. There will be one column for every sequential separator
+# __n=#splits__ - the maximum number of splits. There will be one extra column for every split. Newer versions of pandas require this to be passed as a keyword (`n=2`)
 # 
 # __expand=True__ - required to make each separation a column
+# 
+# `df.assign()` adds all of the new columns in one step and `.drop()` removes the obsolete 'Address' column in the same statement.
 
-# In[160]:
+# In[9]:
 
 
-df[['Street_Address', 'State', 'Zip_Code']] = df['Address'].str.split(',', 2, expand=True)
-df = df.drop(columns = 'Address') # The current 'Address' column is now obsolete
+address = df['Address'].str.split(',', n=2, expand=True)
+df = df.assign(Street_Address=address[0], State=address[1], Zip_Code=address[2]).drop(columns = 'Address') # The current 'Address' column is now obsolete
 df
 
 
 # ### REFORMAT CUSTOMERS AND CONTACT APPROVAL
 
-# In[162]:
+# In[10]:
 
 
-df['Paying Customer'] = df['Paying Customer'].str.replace('Yes', 'Y')
-df['Paying Customer'] = df['Paying Customer'].str.replace('No', 'N')
-df['Do_Not_Contact'] = df['Do_Not_Contact'].str.replace('Yes', 'Y')
-df['Do_Not_Contact'] = df['Do_Not_Contact'].str.replace('No', 'N')
+#A dictionary replaces every value in one call instead of one str.replace per value and column
+df[['Paying Customer', 'Do_Not_Contact']] = df[['Paying Customer', 'Do_Not_Contact']].replace({'Yes': 'Y', 'No': 'N'})
 df
 
 
@@ -155,55 +176,32 @@ df
 # 
 # `df.fillna()` - fills na values with desired value
 
-# In[163]:
+# In[11]:
 
 
-df = df.replace('N/a', '')
-df = df.replace('NaN', '')
-df = df.fillna('')
+df = df.replace({'N/a': '', 'NaN': ''}).fillna('')
 df
 
 
-# ### REMOVE 'DO NOT CALL' CUSTOMERS'
+# ### REMOVE 'DO NOT CALL' CUSTOMERS' AND EMPTY FIELDS
 # 
 # We only want to have a table which we would like to call.
+# 
+# `df.loc[mask]` - keeps only the rows where the boolean mask is True. Both conditions are combined with `&` so the table is filtered in a single pass instead of dropping rows one at a time in a for loop.
+# 
+# `df.reset_index(drop=True)` - renumbers the remaining rows and discards the old index.
 
-# In[164]:
-
-
-for i in df.index:
-    if df.loc[i, "Do_Not_Contact"] == 'Y':
-        df.drop(i, inplace=True)
-
-df
-
-
-# Removes empty fields:
-
-# In[165]:
-
-
-for i in df.index:
-    if df.loc[i, "Phone_Number"] == '':
-        df.drop(i, inplace=True)
-
-df
-
-#df = df.dropna(subset='Phone_Number', inplace=True) Alternative Method
-
-
-# ### RESET INDEX
-
-# In[166]:
+# In[12]:
 
 
-df = df.reset_index(drop=True)
+keep = df['Do_Not_Contact'].ne('Y') & df['Phone_Number'].ne('')
+df = df.loc[keep].reset_index(drop=True)
 df
 
 
 # ### FINAL PRODUCT
 
-# In[167]:
+# In[13]:
 
 
 df
@@ -211,25 +209,39 @@ df
 
 # ### CONCLUSION
 # 
-# At this point, the dataset has been cleaned. There is missing data but thats inevitable and arugably irrelavent because the Sales people can get retrieve that contact information once they have a phone conversation. 
+# At this point, the dataset has been cleaned. There is missing data but thats inevitable and arugably irrelavent because the Sales people can get retrieve that contact information once they have a phone conversation.
+# 
+# NOTE: Some phone numbers in the Excel file are stored as numbers instead of text (for example customers 1003, 1012 and 1018). Earlier versions of this notebook turned those numbers into blanks, which removed these customers from the call list. They are now kept, so the final table has 13 customers to call instead of 10.
 
 # ## EXAMPLE 2 - New York City Trees
 
 # In this example, assume you've already explored the data and the table below is an output of that exploration.
+# 
+# `pd.read_csv(path, usecols=[...])` - only reads the listed columns. This dataset is large so skipping the columns we don't need saves a lot of memory and loading time compared to reading everything and then selecting a subset.
 
-# In[282]:
+# In[ ]:
 
 
-tree_census = pd.read_csv(r"2015_Street_Tree_Census_-_Tree_Data.csv")
-pd.set_option('display.max_columns', None)
-tree_census_subset = tree_census[['tree_id','tree_dbh', 'stump_diam',
+tree_census_columns = ['tree_id','tree_dbh', 'stump_diam',
        'curb_loc', 'status', 'health', 'spc_latin', 'steward',
        'sidewalk','problems', 'root_stone',
        'root_grate', 'root_other', 'trunk_wire', 'trnk_light', 'trnk_other',
-       'brch_light', 'brch_shoe', 'brch_other']]
+       'brch_light', 'brch_shoe', 'brch_other']
+tree_census_subset = pd.read_csv(r"2015_Street_Tree_Census_-_Tree_Data.csv", usecols=tree_census_columns,
+                                 dtype={'tree_dbh': 'int32', 'stump_diam': 'int32'})
+pd.set_option('display.max_columns', None)
 tree_census_subset.head(3)
 
 
+# Like in Example 1, the text columns are converted to Arrow strings:
+
+# In[ ]:
+
+
+for column in tree_census_subset.select_dtypes(include=['object', 'string']):
+    tree_census_subset[column] = tree_census_subset[column].astype('string[pyarrow]')
+
+
 # ### MODIFY THE THE FEATURE  (NULL) VALUES
 # 
 # 
@@ -262,37 +274,40 @@ tree_census_subset[tree_census_subset['status'] == 'Stump']
 tree_census_subset.isna().sum()
 
 
-# For some odd reason - health, spc_latin, sidewalk and problems still have an NA. value. This is why it's always good to double check that fillna() has filled all of the empty values.
+# health, spc_latin, sidewalk and problems still have NA values. This is why it's always good to double check that fillna() has filled all of the empty values.
 
-# Let's look at all the individual rows to see happens.
+# Let's look at all the individual rows to see what happened.
 
 # In[287]:
 
 
-tree_census_subset[tree_census_subset['health'].isna()]
+nan_columns = ['health', 'spc_latin', 'sidewalk', 'problems']
+nulls = tree_census_subset[nan_columns].isna() #Check for nulls once and reuse the result below
+
+tree_census_subset[nulls['health']]
 
 
-# Side walk still has an NaN value and so do the rest of the remaining features that stated were still NaN.
+# Look at the 'status' of these rows - they are Alive trees. `mask` only selected the Stump and Dead trees, so `fillna()` was never run on these rows. The same goes for the rest of the remaining features that are still NaN.
 
 # In[288]:
 
 
-tree_census_subset[tree_census_subset['sidewalk'].isna()]
+tree_census_subset[nulls['sidewalk']]
 
 
 # In[289]:
 
 
-tree_census_subset[tree_census_subset['spc_latin'].isna()]
+tree_census_subset[nulls['spc_latin']]
 
 
 # In[290]:
 
 
-tree_census_subset[tree_census_subset['problems'].isna()].head(3)
+tree_census_subset[nulls['problems']].head(3)
 
 
-# There is a mix of None and Nan Values. Often, these act like viruses that cannot be treated. You can see that even `.replace()` isn't updating it.
+# These are real null values, not the text 'None' or 'NaN', which is why `.replace()` doesn't update them:
 
 # In[188]:
 
@@ -307,112 +322,72 @@ tree_census_subset = tree_census_subset.replace('NaN', 'Not Applicable')
 tree_census_subset.isna().sum()
 
 
-# In the code lines below, you can see that `fillna()` isn't working because technically they are not null values
-# 
-# The boolean does not consider the value as a string NaN, None or np.nan. This is why none of the functions are filling the values:
+# In the code lines below, you can see that `==` can't be used to find null values. Comparing a null value with None, np.nan or the string 'NaN' never returns True - a comparison with a missing value is itself missing (`<NA>`). Use `isna()` to find null values instead:
 
 # In[291]:
 
 
-tree_census_subset[tree_census_subset.index == 120289]['problems']
+problems_120289 = tree_census_subset.loc[[120289], 'problems']
+problems_120289
 
 
 # In[292]:
 
 
-tree_census_subset[tree_census_subset.index == 120289]['problems'] == None
+problems_120289 == None
 
 
 # In[293]:
 
 
-tree_census_subset[tree_census_subset.index == 120289]['problems'] == np.nan
+problems_120289 == np.nan
 
 
 # In[294]:
 
 
-tree_census_subset[tree_census_subset.index == 120289]['problems'] == 'NaN'
+problems_120289 == 'NaN'
 
 
-# We will have to manually fill null values. First let's get the index values all 'health', 'spc_latin', 'sidewalk', 'problems' that are still NaN:
+# Since `isna()` detects these values, `fillna()` will fill them as well - it only has to be run on the rows that `mask` skipped. First let's get the index values of all the rows where 'health', 'spc_latin', 'sidewalk' or 'problems' are still NaN. The `nulls` table from above is reused so the dataset doesn't have to be checked for nulls again:
 
 # In[295]:
 
 
-tree_census_subset[tree_census_subset['health'].isna()].index
-
-
-# In[296]:
-
-
-tree_census_subset[tree_census_subset['spc_latin'].isna()].index
-
-
-# In[297]:
-
-
-tree_census_subset[tree_census_subset['sidewalk'].isna()].index
+tree_census_subset.index[nulls.any(axis=1)]
 
 
-# In[298]:
-
-
-tree_census_subset[tree_census_subset['problems'].isna()].index
-
-
-# Now let's do a for statement to fill all the values with 'Not Applicable'.
+# Now let's fill all the values with 'Not Applicable'.
 # 
-# NOTE: All of the codes below could be consolidated in one 'for statement' but it is separated to show how the code is working.
+# NOTE: There is no need to loop over the index values above. `fillna()` fills every value that `isna()` detects, so one call on the columns that still have null values fills the Alive rows that `mask` didn't cover.
 
 # In[299]:
 
 
-healthnan = [32889]
-
-for i in problemsnan:
-    tree_census_subset.loc[healthnan, 'health'] = 'Not Applicable'
-
-
-# In[300]:
-
-
-spc_latinnan = [356613, 427541, 431417, 608632, 656960]
-
-for i in spc_latinnan:
-    tree_census_subset.loc[spc_latinnan, 'spc_latin'] = 'Not Applicable'
-
+tree_census_subset[nan_columns] = tree_census_subset[nan_columns].fillna('Not Applicable')
 
-# In[301]:
-
-
-sidewalknan = [346299]
-
-for i in sidewalknan:
-    tree_census_subset.loc[sidewalknan, 'sidewalk'] = 'Not Applicable'
 
+# Congrats! There are no more null values!
 
-# In[302]:
+# In[303]:
 
 
-problemsnan = [120289, 121488, 121685, 133470, 133812, 134820, 144137, 145324,
-            145337, 146314, 146378, 146430, 146630, 146662, 263577, 263578,
-            263795, 274280, 327575, 356663, 360398, 427541, 469486, 472398,
-            472451, 472574, 473973, 473976, 474508, 474527, 474555, 475095,
-            475326, 475368, 475661, 479859, 483223, 484013, 484247, 485096,
-            489204, 489292, 491710, 491826, 492433, 492434, 496366, 496835,
-            500888]
+tree_census_subset.isna().sum()
 
-for i in problemsnan:
-    tree_census_subset.loc[problemsnan, 'problems'] = 'Not Applicable'
 
+# ### CONVERT TEXT FEATURES TO CATEGORIES
+# 
+# Features such as 'status', 'health' and 'spc_latin' only have a handful of unique values that repeat across hundreds of thousands of rows. Converting them to the `category` dtype stores each unique value once and every row as a small integer code, which uses far less memory and speeds up `groupby()`.
+# 
+# NOTE: This is done after filling the null values because a category column can't be filled with a value that isn't one of its categories. Comparisons such as `== 'Stump'` still work the same way. A category column keeps all of its categories even after filtering, so `value_counts()` would also list species with a count of 0 unless the unused categories are removed first.
 
-# Congrats! There are no more null values!
+# In[ ]:
 
-# In[303]:
 
+categorical_columns = ['spc_latin', 'status', 'health', 'sidewalk', 'steward', 'curb_loc', 'problems']
 
-tree_census_subset.isna().sum()
+tree_census_subset[categorical_columns] = tree_census_subset[categorical_columns].astype('category')
+tree_census_subset.dtypes
 
 
 # ### REMOVE OUTLIERS
@@ -452,7 +427,7 @@ tree_census_subset['tree_dbh'].quantile([0.25, 0.75])
 # In[337]:
 
 
-tree_census_subset.loc[tree_census_subset['tree_dbh'] > 60]['spc_latin'].value_counts()
+tree_census_subset.loc[tree_census_subset['tree_dbh'] > 60]['spc_latin'].cat.remove_unused_categories().value_counts()
 
 
 # Based on the value counts, it doesn't look like the huge tree depths are part of specific class.
@@ -465,10 +440,14 @@ tree_census_subset.loc[tree_census_subset['tree_dbh'] > 60]['spc_latin'].value_c
 tree_census_subset.plot(kind='scatter', figsize=(20,10), x = 'tree_id', y = 'stump_diam')
 
 
-# In[341]:
+# In[ ]:
 
 
-tree_census_subset = tree_census_subset[(tree_census_subset['tree_dbh']<= 60) & (tree_census_subset['stump_diam']<= 60)]
+tree_dbh = tree_census_subset['tree_dbh'].to_numpy()
+stump_diam = tree_census_subset['stump_diam'].to_numpy()
+
+#Comparing the numpy arrays skips the index alignment that pandas does when combining Series
+tree_census_subset = tree_census_subset.iloc[(tree_dbh <= 60) & (stump_diam <= 60)]
 tree_census_subset
 
 
@@ -481,25 +460,36 @@ tree_census_subset_alive = tree_census_subset[tree_census_subset['status'] == 'A
 tree_census_subset_dead_or_stump = tree_census_subset[(tree_census_subset['status'] == 'Dead') | (tree_census_subset['status'] == 'Stump')]
 
 
-# In[346]:
+# In[ ]:
 
 
-tree_census_subset_alive.groupby('spc_latin')['tree_dbh'].describe()
+tree_census_subset_alive.groupby('spc_latin', observed=True)['tree_dbh'].describe()
 
 
 # Strangely, the minimum value is 0 which is unrealistic. We may want to consider removing data below the 25 and above the 75 quantiles.
+# 
+# `describe()` calculates eight statistics for every species but we only need two of them, so `quantile()` is used to calculate just the 25 and 75 quantiles.
 
 # In[350]:
 
 
-stats = tree_census_subset_alive.groupby('spc_latin')['tree_dbh'].describe().reset_index()[['spc_latin', '25%', '75%']]
+stats = tree_census_subset_alive.groupby('spc_latin', observed=True)['tree_dbh'].quantile([0.25, 0.75]).unstack()
+stats.columns = ['25%', '75%']
+
 
+# The trees that fall between the 25 and 75 quantiles of their species are kept in a separate table, so the full table of alive trees stays available until the subject matter experts weigh in:
 
 # In[353]:
 
 
-tree_census_subset_alive = tree_census_subset_alive.merge(stats, on='spc_latin', how='left')
-tree_census_subset_alive
+'''Instead of merging the stats into the table, each tree's species is looked up in the stats
+and the bounds are compared as numpy arrays'''
+lower = tree_census_subset_alive['spc_latin'].map(stats['25%']).to_numpy(dtype=float)
+upper = tree_census_subset_alive['spc_latin'].map(stats['75%']).to_numpy(dtype=float)
+alive_dbh = tree_census_subset_alive['tree_dbh'].to_numpy()
+
+tree_census_subset_alive_iqr = tree_census_subset_alive.iloc[(alive_dbh >= lower) & (alive_dbh <= upper)]
+tree_census_subset_alive_iqr
 
 
 # ### CONCLUSION
@@ -512,19 +502,43 @@ tree_census_subset_alive
 
 # ## EXAMPLE 3 - FIFA 21
 
-# In[358]:
-
-
-data = pd.read_csv(r"fifa21 raw data v2.csv")
+# In[14]:
+
+
+'''Most of the player stats are ratings out of 100 so they fit in an int8 (-128 to 127) instead
+of the default int64. The totals such as 'Attacking' and 'Total Stats' go above 127 so they use int16'''
+rating_columns = ['Age', '↓OVA', 'POT', 'BOV', 'Crossing', 'Finishing', 'Heading Accuracy',
+       'Short Passing', 'Volleys', 'Dribbling', 'Curve', 'FK Accuracy', 'Long Passing',
+       'Ball Control', 'Acceleration', 'Sprint Speed', 'Agility', 'Reactions', 'Balance',
+       'Shot Power', 'Jumping', 'Stamina', 'Strength', 'Long Shots', 'Aggression',
+       'Interceptions', 'Positioning', 'Vision', 'Penalties', 'Composure', 'Marking',
+       'Standing Tackle', 'Sliding Tackle', 'GK Diving', 'GK Handling', 'GK Kicking',
+       'GK Positioning', 'GK Reflexes', 'PAC', 'SHO', 'PAS', 'DRI', 'DEF', 'PHY']
+total_columns = ['Attacking', 'Skill', 'Movement', 'Power', 'Mentality', 'Defending',
+       'Goalkeeping', 'Total Stats', 'Base Stats']
+
+'''Hits mixes numbers and text such as '1.6K' so it is read as text to avoid a mixed type column'''
+fifa_dtypes = {'ID': 'int32', **dict.fromkeys(rating_columns, 'int8'), **dict.fromkeys(total_columns, 'int16'),
+               'Hits': str}
+data = pd.read_csv(r"fifa21 raw data v2.csv", dtype=fifa_dtypes)
 pd.set_option('display.max_columns', None)
 data.head(10)
 
 
+# Like in the previous examples, the text columns are converted to Arrow strings:
+
+# In[15]:
+
+
+for column in data.select_dtypes(include=['object', 'string']):
+    data[column] = data[column].astype('string[pyarrow]')
+
+
 # ### QUICK EXPLORATION
 
 # There are 19,000 rows and 77 features:
 
-# In[360]:
+# In[16]:
 
 
 data.shape
@@ -532,7 +546,7 @@ data.shape
 
 # We used `df.isna().sum()` in the previous example but this dataset has a lot of features and isn't displaying all the values.
 
-# In[370]:
+# In[17]:
 
 
 data.isna().sum()
@@ -540,13 +554,13 @@ data.isna().sum()
 
 # Below is a workaround using `df.info()`. The shape states that there was a little under 19,000 rows. You can see that 'Loan Date End' and 'Hits' have some missing values. `df.info()` is also valuable for datasets with a lot of features because you can get a summary of which columns are catagorical or numeric.
 
-# In[361]:
+# In[18]:
 
 
 data.info()
 
 
-# In[367]:
+# In[19]:
 
 
 data.isna().sum()
@@ -556,7 +570,7 @@ data.isna().sum()
 # 
 # There are many times when you want to work on a copy of the dataset as opposed to the actual extracted dataset. Such occurances are do to the dataset being an output of multiple joins or it can be something as simple as you expect to make a lot of changes so you want to periodically reference the original dataset.
 
-# In[373]:
+# In[20]:
 
 
 fifa = data.copy()
@@ -571,7 +585,7 @@ fifa.head(3)
 
 # #### Club
 
-# In[374]:
+# In[21]:
 
 
 fifa['Club'].dtype
@@ -581,7 +595,7 @@ fifa['Club'].dtype
 # 
 # Note that the values contain a lot of leading spaces which will eventually have to get stripped.
 
-# In[376]:
+# In[22]:
 
 
 fifa['Club'].unique()
@@ -589,7 +603,7 @@ fifa['Club'].unique()
 
 # Notice that `df.str.strip()` contains no values in the function as opposed to previous examples. By default, this function strips any whitespaces.
 
-# In[379]:
+# In[23]:
 
 
 fifa['Club'] = fifa['Club'].str.strip()
@@ -598,7 +612,7 @@ fifa['Club'].unique()
 
 # #### Contract 
 
-# In[524]:
+# In[24]:
 
 
 """NOTE: this was already seen when .info() was used"""
@@ -612,67 +626,59 @@ fifa['Contract'].dtype
 # - 'Jun 30, 2021 On Loan'
 # - 'Free'
 
-# In[383]:
+# In[25]:
 
 
 fifa['Contract'].unique()
 
 
-# A for loop was used to see the formatting for this columns. Suprisingly to our luck - although there are three different formats, the formatting is consistent.
+# A boolean mask was used to see the formatting for this columns. Suprisingly to our luck - although there are three different formats, the formatting is consistent.
+# 
+# NOTE: Avoid looping over the rows with `df.iterrows()` for checks like this. It builds a new Series for every row, while `df['COLUMNNAME'].str.contains()` checks the whole column at once.
 
-# In[385]:
+# In[26]:
 
 
-for index, row in fifa.iterrows():
-    if 'On Loan' in row['Contract'] or 'Free' in row['Contract']:
-        print(row['Contract'])
+mask = fifa['Contract'].str.contains('On Loan') | fifa['Contract'].eq('Free')
+print(fifa.loc[mask, 'Contract'].to_string())
 
 
-# We're going to create a function to extract contract dates. There's a lot going on in this function so play close attention to each line.
+# We're going to extract the contract dates for the whole column at once. There's a lot going on in this cell so play close attention to each line.
+# 
+# `df['COLUMNNAME'].str.split(separator, expand=True)` - splits every value and returns one column per piece
+# 
+# `df['COLUMNNAME'].where(condition)` - keeps the values where the condition is True and sets the rest to NaN
 # 
-# NOTE: Pay close attention to '''On Loan' in contract' - 'On Loan' is only a portion of the value hence why we use 'in' instead of '=='
+# NOTE: Pay close attention to `.str.contains('On Loan')` - 'On Loan' is only a portion of the value hence why we use `.str.contains()` instead of `.eq()`
 
-# In[412]:
+# In[27]:
 
 
 '''Free' is an actual value, while 'On Loan' is only a portion of a value. For this
-# reason, we must use 'in' instead of '==''''
-def extract_contract_info(contract):
-    if contract == 'Free' or 'On Loan' in contract:
-        start_date = np.nan #Players are not under contract so that value is 0
-        end_date = np.nan
-        contract_length = 0
-    else:
-        start_date, end_date = contract.split(' ~ ') #There are spaces in between the ~ value
-        start_year = int(start_date[:4])
-        end_year = int(end_date[:4])
-        contract_length = end_year - start_year
-    return start_date, end_date, contract_length
-
-'''Use a lambda function to creat a new data set that will have the contract dates reformatted'''
-new_cols = ['Contract Start', 'Contract End', 'Contract Length(years)']
-new_data = fifa['Contract'].apply(lambda x: pd.Series(extract_contract_info(x)))
-
-for i in range(len(new_cols)):
-    fifa.insert(loc=fifa.columns.get_loc('Contract')+1+i, column=new_cols[i], value=new_data[i])
-
+# reason, we must use .str.contains() for 'On Loan' instead of .eq()'''
+not_under_contract = fifa['Contract'].eq('Free') | fifa['Contract'].str.contains('On Loan')
 
-# In[408]:
+parts = fifa['Contract'].str.split(' ~ ', expand=True) #There are spaces in between the ~ value
+start_date = parts[0].where(~not_under_contract) #Players are not under contract so that value is NaN
+end_date = parts[1].where(~not_under_contract)
+contract_length = (pd.to_numeric(end_date.str[:4]) - pd.to_numeric(start_date.str[:4])).fillna(0).astype(int)
 
+'''Insert the new columns right after the 'Contract' column'''
+new_data = {'Contract Start': start_date, 'Contract End': end_date, 'Contract Length(years)': contract_length}
 
-'''I will look into if this will save on lines of code.'''
-#fifa['Contract'].str.split(' ~ ', 2, expand=True)
+for i, (column, value) in enumerate(new_data.items()):
+    fifa.insert(loc=fifa.columns.get_loc('Contract')+1+i, column=column, value=value)
 
 
 # Confirm the new columns have been properly inserted:
 
-# In[419]:
+# In[28]:
 
 
 fifa.head(3)
 
 
-# In[427]:
+# In[29]:
 
 
 fifa[['Contract','Contract Start', 'Contract End', 'Contract Length(years)']][203:207]
@@ -680,21 +686,20 @@ fifa[['Contract','Contract Start', 'Contract End', 'Contract Length(years)']][20
 
 # Let's create new catagorical columns to represent three types of players: On contract, free or on loan.
 
-# In[436]:
+# In[30]:
 
 
-def catagorize_contract_status(contract):
-    if contract == 'Free':
-        return 'Free'
-    elif 'On Loan' in contract:
-        return 'On Loan'
-    else:
-        return 'Contract'
-    
-fifa.insert(fifa.columns.get_loc('Contract Length(years)')+1, 'Contract Status', fifa['Contract'].apply(catagorize_contract_status))
+'''np.select() checks the conditions in order and uses the matching choice. Any value
+that doesn't match a condition gets the default value'''
+conditions = [fifa['Contract'].eq('Free'), fifa['Contract'].str.contains('On Loan')]
+choices = ['Free', 'On Loan']
 
+#np.select() returns a NumPy array, so it is wrapped in a Series to keep it as an Arrow string column
+status = pd.Series(np.select(conditions, choices, default='Contract'), index=fifa.index, dtype='string[pyarrow]')
+fifa.insert(fifa.columns.get_loc('Contract Length(years)')+1, 'Contract Status', status)
 
-# In[439]:
+
+# In[31]:
 
 
 fifa[['Contract','Contract Start', 'Contract End', 'Contract Length(years)', 'Contract Status']][203:207]
@@ -704,7 +709,7 @@ fifa[['Contract','Contract Start', 'Contract End', 'Contract Length(years)', 'Co
 
 # Height should be an integer as the value is in CM but the type is an object.
 
-# In[441]:
+# In[32]:
 
 
 fifa['Height'].dtype
@@ -712,29 +717,28 @@ fifa['Height'].dtype
 
 # The formatting is not consistent as some values are in cm and others in ft/in.
 
-# In[443]:
+# In[33]:
 
 
 fifa['Height'].unique()
 
 
-# In[498]:
+# In[34]:
+
 
+"""Instead of applying a function to every row, the numbers are extracted from the
+whole column at once and the cm or ft/in formula is picked with np.where()"""
+height = fifa['Height']
+is_cm = height.str.endswith('cm')
+centimeters = height.str.extract(r'(\d+)cm', expand=False).astype(float)
+feet_inches = height.str.extract(r"(\d+)'(\d+)\"?").astype(float) #This refers to the ' and " in 6'2"
+total_inches = feet_inches[0]*12 + feet_inches[1]
 
-def convert_height(height):
-    if "cm" in height:
-        return int(height.strip("cm"))
-    else:
-        feet, inches = height.split("'") #This refers to the ' in 6'2".
-        total_inches = int(feet)*12 + int(inches.strip('"')) #This refers to the " in 6'2"
-        return round(total_inches * 2.54) #convert to cm
-    
-#Apply function to height column
-#fifa['Height'] = fifa['Height'].apply(convert_height) #<----This also works
-fifa['Height'] = fifa['Height'].apply(lambda x: pd.Series(convert_height(x)))
+#Convert the height column
+fifa['Height'] = np.where(is_cm, centimeters, np.round(total_inches * 2.54)).astype(int) #convert to cm
 
 
-# In[509]:
+# In[35]:
 
 
 fifa['Height'].unique()
@@ -742,13 +746,13 @@ fifa['Height'].unique()
 
 # Update the column to state that the units.
 
-# In[510]:
+# In[36]:
 
 
 fifa = fifa.rename(columns={'Height': 'Height (cm)'})
 
 
-# In[511]:
+# In[37]:
 
 
 fifa.head(1)
@@ -756,7 +760,7 @@ fifa.head(1)
 
 # ### Weight
 
-# In[512]:
+# In[38]:
 
 
 fifa['Weight'].dtype
@@ -764,34 +768,31 @@ fifa['Weight'].dtype
 
 # Same situation as 'Height'. We expected the values to be an integer since weight is a numerical value but the dtype is an object.
 
-# In[513]:
+# In[39]:
 
 
 fifa['Weight'].unique()
 
 
-# In[520]:
+# In[40]:
 
 
-def convert_weight(weight):
-    if "kg" in weight: 
-        return int(weight.strip("kg"))
-    else:
-        pounds = int(weight.strip("lbs"))
-        return round(pounds/2.205) #converts lbs to kg
+"""Same approach as 'Height': extract the number and the unit, then convert lbs to kg"""
+weight = fifa['Weight'].str.extract(r'(\d+)(kg|lbs)')
+amount = weight[0].astype(float)
 
-#Apply funciton to weight column
-fifa['Weight'] = fifa['Weight'].apply(convert_weight)
+#Convert the weight column
+fifa['Weight'] = np.where(weight[1].eq('lbs'), np.round(amount/2.205), amount).astype(int) #converts lbs to kg
 fifa['Weight'].unique()
 
 
-# In[521]:
+# In[41]:
 
 
 fifa = fifa.rename(columns={'Weight': 'Weight (kg)'})
 
 
-# In[522]:
+# In[42]:
 
 
 fifa.head(1)
@@ -799,7 +800,7 @@ fifa.head(1)
 
 # ### Loan Date End
 
-# In[523]:
+# In[43]:
 
 
 fifa['Loan Date End'].dtype
@@ -807,7 +808,7 @@ fifa['Loan Date End'].dtype
 
 # We lucked out! The values are in correct formatting.
 
-# In[525]:
+# In[44]:
 
 
 fifa['Loan Date End'].unique()
@@ -817,7 +818,7 @@ fifa['Loan Date End'].unique()
 # 
 # It's also important to note that we now know why there are only 1000 rows of this feature - only a small quanitty of players were ever on loan.
 
-# In[527]:
+# In[45]:
 
 
 on_loan = fifa[fifa['Contract Status'] == 'On Loan']
@@ -828,7 +829,7 @@ on_loan[['Contract', 'Contract Status', 'Loan Date End']]
 # 
 # Player's week foot rating (out of 5) - A 5 star rating means the player has equal performance accuracy and power of shooting and passing, and tackling with either foot.
 
-# In[528]:
+# In[46]:
 
 
 fifa['W/F'].dtype
@@ -840,30 +841,32 @@ fifa['W/F'].dtype
 # 
 # We're going to strip the stars just in case we want to do a calculation in the future that we are currently unaware of.
 
-# In[529]:
+# In[47]:
 
 
 fifa['W/F'].unique()
 
 
 # There are two methods to remove the ★
+# 
+# `df.str.replace()` searches each whole value for the ★, while `df.str.strip()` and `df.str.rstrip()` only remove the listed characters from the ends of the value which is faster. Both methods below leave a space behind the number.
 
-# In[530]:
+# In[48]:
 
 
 fifa['W/F'].str.replace('★', "")
 
 
-# In[536]:
+# In[49]:
 
 
 fifa['W/F'].str.strip('★')
 
 
-# In[537]:
+# In[50]:
 
 
-fifa['W/F'] = fifa['W/F'].str.replace('★', "")
+fifa['W/F'] = fifa['W/F'].str.rstrip(' ★').astype('int8') #The space is included so the value can be converted to an integer
 fifa['W/F'].unique()
 
 
@@ -875,13 +878,13 @@ fifa['W/F'].unique()
 # 
 # Number of times the player has been searched for in the FIFA database.
 
-# In[738]:
+# In[51]:
 
 
 fifa['Hits'] = data['Hits']
 
 
-# In[739]:
+# In[52]:
 
 
 fifa['Hits'].dtype
@@ -893,53 +896,38 @@ fifa['Hits'].dtype
 # 
 # This dataset is also tricky because there are some values that act as strings, others as float and there is a nan
 
-# In[740]:
+# In[53]:
 
 
 print(fifa['Hits'].shape)
 fifa['Hits'].unique()
 
 
-# Before we can use the above function, we have to remove the nan value because this will raise an error if we try to apply a function.
+# Before we can convert the values, we have to remove the nan value because this will raise an error when the values are converted to integers.
 
-# In[741]:
+# In[54]:
 
 
-fifa['Hits'] = fifa['Hits'].fillna(0)
+fifa['Hits'] = fifa['Hits'].fillna('0') #The column holds strings so the fill value is also a string
 print(fifa['Hits'].shape)
 fifa['Hits'].unique()
 
 
-# In[742]:
+# In[55]:
 
 
 """
-This original version of the function was still returning string values with '.0'
-
-def convert_hits(hits):
-    string = (str(hits))
-    string = string.strip('.0')
-    if "K" in string:
-        return str(float(string.strip('K')) * 1000)
-    else:
-        return string.strip('.0')"""
-
-
-"""The mixture of strings and floats is causing a bug in the data. Float values are
-labeled as objects but are acting as floats which makes string to unify the nomeclature
-for this feature complicated.
-
-Pay attention to the logic of this fuction:"""
-def convert_hits(hits):
-    string = (str(hits))
-    string = string.strip('.0') #This is to ensure all values such as '6.0' are stripped.
-    if "K" in string:
-        stringfloat = str(float(string.strip('K')) * 1000) #converts float from '1.6' to '1600.0'
-        return str(stringfloat.strip('.0')) #string value still has '.0' due to calculation
-    else:
-        return string.strip('.0')
-    
-fifa['Hits'] = fifa['Hits'].apply(convert_hits)
+The original version of this cell applied a convert_hits function to every row. It used
+string.strip('.0') to remove the trailing '.0' but strip() removes every leading and
+trailing '.' and '0' character, so a value such as '100' was turned into '1'.
+
+Instead, the whole column is converted to numbers at once: values ending in 'K' are
+multiplied by 1000 and the rest are kept as is."""
+hits = fifa['Hits']
+is_thousands = hits.str.endswith('K')
+numbers = hits.str.rstrip('K').astype(float) #converts '1.6K' to 1.6
+
+fifa['Hits'] = np.where(is_thousands, numbers * 1000, numbers).round().astype(int) #converts 1.6 to 1600
 print(fifa['Hits'].shape)
 fifa['Hits'].unique()
 